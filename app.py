@@ -1,13 +1,32 @@
+import asyncio
+import atexit
+import ctypes
+import http.cookiejar
+import itertools
+import json
 import logging
+import logging.handlers
 import os
+import queue
 import re
-from datetime import datetime
+import socket
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from enum import Enum
 from typing import Dict, List
+from urllib.error import HTTPError, URLError
 
-from flask import Flask, jsonify, render_template, request, send_file
-from pytubefix import YouTube
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from quart import Quart, Response, jsonify, render_template, request, send_file
+from pytubefix import Playlist, YouTube, extract, request as yt_request
 from werkzeug.utils import secure_filename
 
 class DownloadType(Enum):
@@ -25,152 +44,600 @@ class Quality(Enum):
     VIDEO_1440P = '1440p'
     VIDEO_2160P = '2160p'
 
-app = Flask(__name__)
+app = Quart(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 64 * 1024 * 1024  # 64MB max-limit
 app.config['DOWNLOAD_FOLDER'] = Path('downloads')
 app.config['DOWNLOAD_FOLDER'].mkdir(exist_ok=True)
+app.config['RESPONSE_TIMEOUT'] = None  # large downloads outlive Quart's 60s default
+# When set (e.g. '/_protected/'), finished files are handed to nginx via
+# X-Accel-Redirect instead of being streamed through Python
+app.config['X_ACCEL_REDIRECT_PREFIX'] = os.environ.get('X_ACCEL_REDIRECT_PREFIX')
 
-# Enhanced logging with file handler
+# Enhanced logging with file handler. The QueueHandler formats each record on
+# the calling thread and queues it; a listener thread writes it to the file
+# and console.
+_log_queue = queue.Queue(-1)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('youtube_downloader.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
+)
+_log_listener = logging.handlers.QueueListener(
+    _log_queue,
+    logging.handlers.RotatingFileHandler(
+        'youtube_downloader.log',
+        maxBytes=10 * 1024 * 1024,
+        backupCount=5,
+        delay=True
+    ),
+    logging.StreamHandler()
 )
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
+# One pooled keep-alive session for every pytubefix request, so the watch page,
+# player, innertube and googlevideo calls reuse TLS connections
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=50,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, backoff_factor=0.2)
+))
+# urlopen kept no cookies; don't let one user's YouTube cookies leak into
+# every later request
+_SESSION.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+
+class _SessionResponse:
+    """Expose a requests response through the urllib interface pytubefix reads."""
+
+    def __init__(self, response):
+        self._response = response
+
+    def read(self):
+        # Like urlopen: the whole body on the first call, then b''
+        return self._response.raw.read(decode_content=True)
+
+    def info(self):
+        return self._response.headers
+
+    @property
+    def status(self):
+        return self._response.status_code
+
+    def close(self):
+        # Drain the body first; closing an unread streamed response would drop
+        # the connection instead of returning it to the pool
+        self._response.content
+        self._response.close()
+
+def _execute_request(url, method=None, headers=None, data=None,
+                     timeout=socket._GLOBAL_DEFAULT_TIMEOUT):
+    """Drop-in replacement for pytubefix.request._execute_request."""
+    base_headers = {"User-Agent": "Mozilla/5.0", "accept-language": "en-US,en"}
+    if headers:
+        base_headers.update(headers)
+    if data and not isinstance(data, bytes):
+        data = json.dumps(data).encode('utf-8')
+    if not url.lower().startswith('http'):
+        raise ValueError("Invalid URL")
+    if timeout is socket._GLOBAL_DEFAULT_TIMEOUT:
+        timeout = None
+    method = method or ('POST' if data else 'GET')
+    
+    try:
+        # Bodies are read lazily, as pytubefix sometimes only wants headers;
+        # HEAD has none, so let requests consume it and free the connection
+        response = _SESSION.request(
+            method, url, headers=base_headers, data=data,
+            timeout=timeout, stream=method != 'HEAD'
+        )
+    except requests.Timeout as e:
+        raise URLError(socket.timeout(str(e)))
+    except requests.RequestException as e:
+        raise URLError(e)
+    
+    # pytubefix relies on urllib's HTTPError (e.g. 404 -> sequential stream)
+    if response.status_code >= 400:
+        _SessionResponse(response).close()
+        raise HTTPError(url, response.status_code, response.reason,
+                        response.headers, None)
+    return _SessionResponse(response)
+
+yt_request._execute_request = _execute_request
+
+# In-process cache of YouTube objects keyed by the 11-char video id, so the
+# info -> download flow only pays for the watch-page fetch once. Entries are
+# (yt, expires_at).
+_YT_CACHE_MAXSIZE = 2000
+_YT_CACHE_TTL = 5 * 60 * 60  # stream URLs are signed for ~6h
+_YT_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_YT_CACHE_LOCK = threading.Lock()
+
+# Background download jobs run on their own pool, so at most
+# _MAX_CONCURRENT_DOWNLOADS run at once and the rest queue behind them without
+# tying up the default executor. Finished jobs are evicted oldest-first.
+_MAX_CONCURRENT_DOWNLOADS = 8
+_MAX_TRACKED_JOBS = 1000
+_DOWNLOAD_POOL = ThreadPoolExecutor(
+    max_workers=_MAX_CONCURRENT_DOWNLOADS, thread_name_prefix='download'
+)
+_JOBS: "OrderedDict[str, asyncio.Future]" = OrderedDict()
+
+# Completed downloads keyed by "<video_id>:<itag>:<type>", persisted next to the files
+# so a repeat request is served from disk instead of being downloaded again
+_DOWNLOAD_CACHE_PATH = app.config['DOWNLOAD_FOLDER'] / '.cache.json'
+_DOWNLOAD_CACHE_LOCK = threading.Lock()
+
+def _load_download_cache():
+    try:
+        return json.loads(_DOWNLOAD_CACHE_PATH.read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+_DOWNLOAD_CACHE: Dict[str, list] = _load_download_cache()
+
+# Videos of a playlist whose info is fetched at the same time
+_PLAYLIST_CONCURRENCY = 8
+
+# Dedicated threads for stream.filesize HEAD requests, so info lookups are not
+# queued behind long-running downloads in the default executor
+_HEAD_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix='filesize')
+
+# Chunks a download may have queued for the disk writer at any one time
+_WRITE_QUEUE_DEPTH = 4
+# Small chunks (e.g. sequential segments) are coalesced into writes this big
+_WRITE_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Linux fallocate(2) fails on filesystems without native support, where
+# glibc's posix_fallocate would instead write out every block up front
+_fallocate = None
+if sys.platform.startswith('linux'):
+    try:
+        _fallocate = ctypes.CDLL(None, use_errno=True).fallocate
+        _fallocate.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64]
+        _fallocate.restype = ctypes.c_int
+    except (AttributeError, OSError):
+        _fallocate = None
+
+# Compiled once at import
+_YT_RE = re.compile(
+    r'(?:https?://)?(?:www\.)?(?:youtube|youtu|youtube-nocookie)\.(?:com|be)/'
+    r'(?:watch\?v=|embed/|v/|shorts/|live/|.+\?v=)?([A-Za-z0-9_-]{11})'
+)
+_PLAYLIST_RE = re.compile(
+    r'(?:https?://)?(?:www\.)?youtube\.com/.*[?&]list=([A-Za-z0-9_-]+)'
+)
+# Drops problematic characters in a single pass; secure_filename already
+# collapses whitespace runs into underscores
+_SANITIZE_TABLE = str.maketrans('', '', '<>:"/\\|?*')
+# Disambiguates filenames created within the same clock tick
+_FN_COUNTER = itertools.count()
+
 def validate_youtube_url(url):
-    """Validate YouTube URL format with improved regex."""
-    youtube_regex = (
-        r'(https?://)?(www\.)?(youtube|youtu|youtube-nocookie)\.(com|be)/'
-        r'(watch\?v=|embed/|v/|.+\?v=)?([^&=%\?]{11})'
-    )
-    match = re.match(youtube_regex, url)
-    if not match:
+    """Validate YouTube URL format and return it along with the video id."""
+    if not _YT_RE.match(url):
         raise ValueError("Invalid YouTube URL format")
+    # Same id extraction YouTube() uses, so cache keys always name the video
+    return url, extract.video_id(url)
+
+def validate_playlist_url(url):
+    """Validate YouTube playlist URL format."""
+    if not url or not _PLAYLIST_RE.match(url):
+        raise ValueError("Invalid YouTube playlist URL format")
     return url
 
 def sanitize_filename(filename, file_type):
     """Sanitize filename for safe storage with additional characters removal."""
+    # Truncate before sanitizing so long titles are only scanned once, keeping
+    # the extension; the 200 chars leave room for the suffix under OS limits
+    base, ext = os.path.splitext(filename)
+    filename = base[:200] + ext[:10]
+    
     # Remove any potentially problematic characters
-    filename = re.sub(r'[<>:"/\\|?*]', '', filename)
-    filename = secure_filename(filename)
-    filename = re.sub(r'\s+', '_', filename)
+    filename = secure_filename(filename.translate(_SANITIZE_TABLE))
     
-    # Add timestamp and proper extension
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     base, ext = os.path.splitext(filename)
+    base = base[:200]  # Unicode normalization can lengthen a few characters
     if not ext:
         ext = '.mp3' if file_type == DownloadType.AUDIO else '.mp4'
     
-    # Truncate filename to prevent OS filename length limits
-    return f"{base[:100]}_{timestamp}{ext}"[:255]
+    # Nanosecond clock plus a counter stays unique under concurrent downloads
+    return f"{base}_{time.time_ns():x}_{next(_FN_COUNTER):x}{ext}"
 
-def get_video_info(url):
-    """Get comprehensive video information including all available formats."""
+def _abr_kbps(bitrate):
+    """Parse a pytubefix bitrate such as '128kbps' into an int, 0 if unknown."""
+    if not bitrate or not bitrate.endswith('kbps'):
+        return 0
     try:
-        yt = YouTube(url)
+        return int(bitrate[:-4])
+    except ValueError:
+        return 0
+
+def _fetch_watch_html(watch_url, etag=None):
+    """Fetch the watch page, revalidating with If-None-Match when an ETag is known.
+
+    Returns ``(html, etag)``; ``html`` is None when the page is unchanged (304).
+    """
+    headers = {'If-None-Match': etag} if etag else None
+    response = _execute_request(watch_url, headers=headers)
+    if response.status == 304:
+        # close() drains the empty body, so the connection goes back to the pool
+        response.close()
+        return None, etag
+    return response.read().decode('utf-8'), response.info().get('ETag')
+
+class _RevalidatingYouTube(YouTube):
+    """YouTube whose watch page is fetched lazily and revalidated by ETag.
+
+    Most metadata and the streams come from innertube, so the watch page is
+    only downloaded if something (e.g. ``publish_date``) actually reads it.
+    Once the publish date is parsed the page is dropped, so cached objects
+    keep just the date and the page's ETag. An object replacing an expired
+    cache entry reuses that entry's date if the server answers 304.
+    """
+
+    def __init__(self, url, previous=None):
+        super().__init__(url)
+        self._watch_etag = None
+        self._previous_watch_etag = None
+        self._previous_publish_date = None
+        if previous and previous._watch_etag and previous._publish_date:
+            self._previous_watch_etag = previous._watch_etag
+            self._previous_publish_date = previous._publish_date
+
+    @property
+    def watch_html(self):
+        if self._watch_html:
+            return self._watch_html
+        self._watch_html, self._watch_etag = _fetch_watch_html(self.watch_url)
+        return self._watch_html
+
+    @property
+    def publish_date(self):
+        if self._publish_date:
+            return self._publish_date
+        if self._previous_watch_etag and not self._watch_html:
+            html, etag = _fetch_watch_html(self.watch_url, self._previous_watch_etag)
+            self._watch_etag = etag
+            if html is None:
+                self._publish_date = self._previous_publish_date
+                return self._publish_date
+            self._watch_html = html
+        self._publish_date = extract.publish_date(self.watch_html)
+        # Only the date is needed later; don't keep ~1 MB of HTML in the cache
+        self._watch_html = None
+        return self._publish_date
+
+    @publish_date.setter
+    def publish_date(self, value):
+        self._publish_date = value
+
+def _get_yt(video_id, url):
+    """Return a cached YouTube object for the video, fetching it on a miss."""
+    now = time.monotonic()
+    with _YT_CACHE_LOCK:
+        entry = _YT_CACHE.get(video_id)
+        if entry and entry[1] > now:
+            _YT_CACHE.move_to_end(video_id)
+            return entry[0]
+
+    # The object is rebuilt even for an expired entry, as its signed stream
+    # URLs expire whether or not the page changed; the old publish date is only
+    # revalidated if the new object needs it
+    yt = _RevalidatingYouTube(url, previous=entry[0] if entry else None)
+    # Touch the streams once so the player config and manifest are cached too
+    yt.streams
+
+    with _YT_CACHE_LOCK:
+        _YT_CACHE[video_id] = (yt, now + _YT_CACHE_TTL)
+        _YT_CACHE.move_to_end(video_id)
+        while len(_YT_CACHE) > _YT_CACHE_MAXSIZE:
+            _YT_CACHE.popitem(last=False)
+    return yt
+
+async def get_video_info(url, video_id, fast=False):
+    """Get comprehensive video information including all available formats.
+
+    With ``fast`` set, stream sizes, description and publish date are skipped
+    (returned as None), which avoids a HEAD request per stream.
+    """
+    try:
+        yt = await asyncio.to_thread(_get_yt, video_id, url)
         streams_info = {
             'audio': [],
             'video': []
         }
+        # Streams whose size still has to be fetched, in the same order as the
+        # dicts they belong to
+        sized_streams = []
+        sized_infos = []
         
         # Get audio streams and sort by quality
         audio_streams = yt.streams.filter(only_audio=True).order_by('abr').desc()
         for stream in audio_streams:
             bitrate = stream.abr
-            if not bitrate:
+            kbps = _abr_kbps(bitrate)
+            if not kbps:
                 continue
                 
             # Improved audio quality classification
-            quality_label = (
-                'High' if 'kbps' in bitrate and int(bitrate.replace('kbps', '')) >= 128 
-                else 'Medium' if 'kbps' in bitrate and int(bitrate.replace('kbps', '')) >= 64 
-                else 'Low'
-            )
+            quality_label = 'High' if kbps >= 128 else 'Medium' if kbps >= 64 else 'Low'
             streams_info['audio'].append({
                 'itag': stream.itag,
                 'type': 'audio',
                 'format': 'mp3',
                 'quality': quality_label,
                 'bitrate': bitrate,
-                'size': f"{stream.filesize / (1024*1024):.1f} MB"
+                'size': None
             })
+            sized_streams.append(stream)
+            sized_infos.append(streams_info['audio'][-1])
         
         # Get all available video streams
         video_streams = yt.streams.filter(progressive=True).order_by('resolution').desc()
         adaptive_streams = yt.streams.filter(adaptive=True, type='video').order_by('resolution').desc()
         
-        # Process and deduplicate video streams with more detailed info
-        processed_resolutions = set()
-        for stream in list(video_streams) + list(adaptive_streams):
+        # Deduplicate on (height, fps) in one pass, preferring progressive
+        # streams since they come first
+        chosen: Dict[tuple, dict] = {}
+        for stream in itertools.chain(video_streams, adaptive_streams):
             resolution = stream.resolution
-            if not resolution or resolution in processed_resolutions:
+            if not resolution:
+                continue
+            key = (int(resolution[:-1]), stream.fps)
+            if key in chosen:
                 continue
                 
-            processed_resolutions.add(resolution)
-            streams_info['video'].append({
+            chosen[key] = {
                 'itag': stream.itag,
                 'type': 'video',
                 'format': 'mp4',
                 'quality': resolution,
                 'fps': stream.fps,
                 'mime_type': stream.mime_type,
-                'size': f"{stream.filesize / (1024*1024):.1f} MB"
-            })
+                'size': None
+            }
+            sized_streams.append(stream)
+            sized_infos.append(chosen[key])
         
-        # Sort video streams by resolution (numerical value)
-        streams_info['video'].sort(
-            key=lambda x: int(x['quality'].replace('p', '')),
-            reverse=True
-        )
+        # Highest resolution first, then highest frame rate
+        streams_info['video'] = [chosen[key] for key in sorted(chosen, reverse=True)]
+        
+        if fast:
+            sized_streams = []
+        
+        # Each filesize may be a HEAD request, so fetch them all concurrently,
+        # along with the publish date, the only metadata read from the watch page
+        loop = asyncio.get_running_loop()
+        lookups = [
+            asyncio.gather(*[
+                loop.run_in_executor(_HEAD_POOL, lambda s=s: s.filesize)
+                for s in sized_streams
+            ])
+        ]
+        if not fast:
+            lookups.append(asyncio.to_thread(getattr, yt, 'publish_date'))
+        sizes, *page_metadata = await asyncio.gather(*lookups)
+        for info, size in zip(sized_infos, sizes):
+            info['size'] = f"{size / (1024*1024):.1f} MB"
+        
+        description = None
+        publish_date = None
+        if not fast:
+            description = yt.description
+            description = description[:300] + '...' if description else ''
+            if page_metadata[0]:
+                publish_date = page_metadata[0].strftime("%Y-%m-%d")
         
         return {
             'title': yt.title,
             'author': yt.author,
             'length': yt.length,
             'thumbnail_url': yt.thumbnail_url,
-            'description': yt.description[:300] + '...' if yt.description else '',
+            'description': description,
             'view_count': yt.views,
-            'publish_date': yt.publish_date.strftime("%Y-%m-%d") if yt.publish_date else None,
+            'publish_date': publish_date,
             'streams': streams_info
         }
     except Exception as e:
         logger.error(f"Error getting video info: {str(e)}")
         raise
 
-def download_content(url, itag, download_type):
+async def get_playlist_info(url, fast=False):
+    """Get video information for every video in a playlist.
+
+    Videos are looked up concurrently, a few at a time; ones that fail are
+    logged and left out.
+    """
+    try:
+        playlist = Playlist(url)
+        # Both lazily load the playlist page, which is not locked, so read them
+        # one after the other to fetch it only once
+        title, video_urls = await asyncio.to_thread(
+            lambda: (playlist.title, list(playlist.video_urls))
+        )
+        
+        semaphore = asyncio.Semaphore(_PLAYLIST_CONCURRENCY)
+        async def fetch(video_url):
+            async with semaphore:
+                return await get_video_info(*validate_youtube_url(video_url), fast=fast)
+        
+        results = await asyncio.gather(
+            *[fetch(video_url) for video_url in video_urls],
+            return_exceptions=True
+        )
+        videos = []
+        for video_url, result in zip(video_urls, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Skipping playlist video {video_url}: {result}")
+                continue
+            videos.append(result)
+        
+        return {'title': title, 'videos': videos}
+    except Exception as e:
+        logger.error(f"Error getting playlist info: {str(e)}")
+        raise
+
+def get_stream(yt, itag):
+    """Look up the stream for an itag, rejecting formats that don't exist."""
+    stream = yt.streams.get_by_itag(itag)
+    if not stream:
+        raise ValueError("Selected format is not available")
+    return stream
+
+def build_filename(yt, stream, download_type):
+    """Build the sanitized output filename for a stream."""
+    file_extension = '.mp3' if download_type == DownloadType.AUDIO else '.mp4'
+    quality_suffix = f"_{stream.resolution}" if stream.resolution else ""
+    return sanitize_filename(f"{yt.title}{quality_suffix}{file_extension}", download_type)
+
+def _save_download_cache():
+    """Persist the download cache; callers must hold _DOWNLOAD_CACHE_LOCK."""
+    tmp_path = _DOWNLOAD_CACHE_PATH.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps(_DOWNLOAD_CACHE))
+    os.replace(tmp_path, _DOWNLOAD_CACHE_PATH)
+
+def _download_cache_key(video_id, itag, download_type):
+    # The type picks the file extension, so it is part of the key
+    return f"{video_id}:{itag}:{download_type.value}"
+
+def get_cached_download(video_id, itag, download_type):
+    """Return the path of a complete earlier download of this format, if any."""
+    with _DOWNLOAD_CACHE_LOCK:
+        entry = _DOWNLOAD_CACHE.get(_download_cache_key(video_id, itag, download_type))
+    if not entry:
+        return None
+    path, size, _ = entry
+    if os.path.exists(path) and os.path.getsize(path) == size:
+        return path
+    return None
+
+def remember_download(video_id, itag, download_type, file_path):
+    """Record a finished download in the persistent cache."""
+    with _DOWNLOAD_CACHE_LOCK:
+        _DOWNLOAD_CACHE[_download_cache_key(video_id, itag, download_type)] = [
+            str(file_path), file_path.stat().st_size, time.time()
+        ]
+        _save_download_cache()
+
+def clear_caches():
+    """Drop the metadata cache and delete every cached download.
+
+    Returns the number of cached downloads removed.
+    """
+    with _YT_CACHE_LOCK:
+        _YT_CACHE.clear()
+    with _DOWNLOAD_CACHE_LOCK:
+        for path, _, _ in _DOWNLOAD_CACHE.values():
+            Path(path).unlink(missing_ok=True)
+        cleared = len(_DOWNLOAD_CACHE)
+        _DOWNLOAD_CACHE.clear()
+        _save_download_cache()
+    return cleared
+
+def iter_stream_chunks(stream):
+    """Yield the stream's bytes, falling back to sequential segments on 404."""
+    try:
+        yield from yt_request.stream(stream.url)
+    except HTTPError as e:
+        if e.code != 404:
+            raise
+        # Some adaptive streams need to be requested with sequence numbers
+        yield from yt_request.seq_stream(stream.url)
+
+class OverlappedWriter:
+    """Write chunks to a file from a background thread.
+
+    The next range request can then run while the previous chunk is still
+    being written, with at most ``depth`` chunks held in memory. When the
+    final ``size`` is known and the filesystem can natively allocate, the
+    file's blocks are reserved up front.
+    """
+
+    def __init__(self, path, size=None, depth=_WRITE_QUEUE_DEPTH):
+        self._file = open(path, 'wb', buffering=_WRITE_BUFFER_SIZE)
+        if size and _fallocate is not None:
+            # A non-zero result means no native support; grow as we write
+            _fallocate(self._file.fileno(), 0, 0, size)
+        self._queue = queue.Queue(maxsize=depth)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        # Keep draining after a failure so the producer never blocks forever
+        while (chunk := self._queue.get()) is not None:
+            if self._error is None:
+                try:
+                    self._file.write(chunk)
+                except Exception as e:
+                    self._error = e
+
+    def write(self, chunk):
+        if self._error is not None:
+            raise self._error
+        self._queue.put(chunk)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+        # Drop any preallocated tail the stream didn't fill
+        self._file.truncate()
+        self._file.close()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def download_content(url, video_id, itag, download_type):
     """Download video or audio content with specified quality and error handling."""
     try:
-        yt = YouTube(url)
-        stream = yt.streams.get_by_itag(itag)
+        cached_path = get_cached_download(video_id, itag, download_type)
+        if cached_path:
+            logger.info(f"Serving cached download: {os.path.basename(cached_path)}")
+            return cached_path
         
-        if not stream:
-            raise ValueError("Selected format is not available")
+        yt = _get_yt(video_id, url)
+        stream = get_stream(yt, itag)
         
         # Improved file naming and path handling
-        file_extension = '.mp3' if download_type == DownloadType.AUDIO else '.mp4'
-        quality_suffix = f"_{stream.resolution}" if stream.resolution else ""
-        filename = sanitize_filename(f"{yt.title}{quality_suffix}{file_extension}", download_type)
+        filename = build_filename(yt, stream, download_type)
         file_path = app.config['DOWNLOAD_FOLDER'] / filename
         
-        # Add a download progress callback (optional)
+        # Progress is reported here rather than through a callback on the
+        # cached YouTube object, which concurrent downloads share. Logged at
+        # most once a second and only when the whole percentage moves.
+        last_logged_at = 0.0
+        last_logged_pct = -1
         def on_progress(stream, chunk, bytes_remaining):
+            nonlocal last_logged_at, last_logged_pct
             total_size = stream.filesize
             bytes_downloaded = total_size - bytes_remaining
-            percentage_of_completion = bytes_downloaded / total_size * 100
-            logger.info(f"Download progress: {percentage_of_completion:.2f}%")
-        
-        yt.register_on_progress_callback(on_progress)
+            percentage_of_completion = bytes_downloaded * 100 // total_size
+            now = time.monotonic()
+            if percentage_of_completion > last_logged_pct and now - last_logged_at >= 1.0:
+                last_logged_at = now
+                last_logged_pct = percentage_of_completion
+                logger.info(f"Download progress: {percentage_of_completion}%")
         
-        # Download with error handling and logging
-        stream.download(
-            output_path=str(app.config['DOWNLOAD_FOLDER']),
-            filename=filename
-        )
+        # Disk writes overlap with fetching the next range
+        bytes_remaining = stream.filesize
+        try:
+            with OverlappedWriter(file_path, bytes_remaining) as writer:
+                for chunk in iter_stream_chunks(stream):
+                    writer.write(chunk)
+                    bytes_remaining -= len(chunk)
+                    on_progress(stream, chunk, bytes_remaining)
+        except BaseException:
+            file_path.unlink(missing_ok=True)
+            raise
         
+        remember_download(video_id, itag, download_type, file_path)
         logger.info(f"Successfully downloaded: {filename}")
         return str(file_path)
     except Exception as e:
@@ -179,15 +646,17 @@ def download_content(url, itag, download_type):
 
 # Routes remain largely the same with minor enhancements
 @app.route('/')
-def index():
-    return render_template('index.html')
+async def index():
+    return await render_template('index.html')
 
 @app.route('/api/video-info', methods=['POST'])
-def get_info():
+async def get_info():
     try:
-        url = request.json.get('url')
-        validate_youtube_url(url)
-        video_info = get_video_info(url)
+        data = await request.get_json()
+        url = data.get('url')
+        fast = data.get('fast') is True or request.args.get('fast') == '1'
+        url, video_id = validate_youtube_url(url)
+        video_info = await get_video_info(url, video_id, fast=fast)
         return jsonify({'success': True, 'data': video_info})
     except ValueError as ve:
         logger.warning(f"Invalid URL attempt: {ve}")
@@ -196,20 +665,42 @@ def get_info():
         logger.error(f"Unexpected error in video info retrieval: {e}")
         return jsonify({'success': False, 'error': 'An unexpected error occurred'}), 500
 
+@app.route('/api/playlist-info', methods=['POST'])
+async def get_playlist():
+    try:
+        data = await request.get_json()
+        url = validate_playlist_url(data.get('url'))
+        fast = data.get('fast') is True or request.args.get('fast') == '1'
+        playlist_info = await get_playlist_info(url, fast=fast)
+        return jsonify({'success': True, 'data': playlist_info})
+    except ValueError as ve:
+        logger.warning(f"Invalid playlist URL attempt: {ve}")
+        return jsonify({'success': False, 'error': str(ve)}), 400
+    except Exception as e:
+        logger.error(f"Unexpected error in playlist info retrieval: {e}")
+        return jsonify({'success': False, 'error': 'An unexpected error occurred'}), 500
+
 @app.route('/api/download', methods=['POST'])
-def download():
+async def download():
     try:
-        url = request.json.get('url')
-        itag = request.json.get('itag')
-        download_type = DownloadType(request.json.get('type', 'audio'))
+        data = await request.get_json()
+        url = data.get('url')
+        itag = data.get('itag')
+        download_type = DownloadType(data.get('type', 'audio'))
+        
+        url, video_id = validate_youtube_url(url)
+        job_id = uuid.uuid4().hex
+        _JOBS[job_id] = asyncio.get_running_loop().run_in_executor(
+            _DOWNLOAD_POOL, download_content, url, video_id, itag, download_type
+        )
         
-        validate_youtube_url(url)
-        file_path = download_content(url, itag, download_type)
+        # Forget the oldest finished jobs so the table stays bounded
+        for old_id in [j for j, future in _JOBS.items() if future.done()]:
+            if len(_JOBS) <= _MAX_TRACKED_JOBS:
+                break
+            del _JOBS[old_id]
         
-        return jsonify({
-            'success': True,
-            'download_url': f'/download/{os.path.basename(file_path)}'
-        })
+        return jsonify({'success': True, 'status': 'pending', 'job_id': job_id})
     except ValueError as ve:
         logger.warning(f"Download error: {ve}")
         return jsonify({'success': False, 'error': str(ve)}), 400
@@ -217,13 +708,88 @@ def download():
         logger.error(f"Download failed: {str(e)}")
         return jsonify({'success': False, 'error': 'An unexpected error occurred during download'}), 500
 
+@app.route('/api/download-status/<job_id>')
+async def download_status(job_id):
+    future = _JOBS.get(job_id)
+    if future is None:
+        return jsonify({'success': False, 'error': 'Unknown download job'}), 404
+    if not future.done():
+        return jsonify({'success': True, 'status': 'pending', 'job_id': job_id})
+    
+    error = future.exception()
+    if isinstance(error, ValueError):
+        return jsonify({'success': False, 'status': 'failed', 'error': str(error)})
+    if error is not None:
+        return jsonify({'success': False, 'status': 'failed', 'error': 'An unexpected error occurred during download'})
+    return jsonify({
+        'success': True,
+        'status': 'done',
+        'download_url': f'/download/{os.path.basename(future.result())}'
+    })
+
+@app.route('/api/stream')
+async def stream_download():
+    """Pipe the stream straight to the client without writing it to disk."""
+    try:
+        url, video_id = validate_youtube_url(request.args.get('url', ''))
+        itag = request.args.get('itag', type=int)
+        download_type = DownloadType(request.args.get('type', 'video'))
+        
+        yt = await asyncio.to_thread(_get_yt, video_id, url)
+        stream = get_stream(yt, itag)
+        filename = build_filename(yt, stream, download_type)
+        filesize = await asyncio.to_thread(lambda: stream.filesize)
+    except ValueError as ve:
+        logger.warning(f"Stream error: {ve}")
+        return jsonify({'success': False, 'error': str(ve)}), 400
+    except Exception as e:
+        logger.error(f"Stream failed: {str(e)}")
+        return jsonify({'success': False, 'error': 'An unexpected error occurred during download'}), 500
+    
+    async def generate():
+        # Each chunk is a blocking range request, so pull them off-loop
+        chunks = iter_stream_chunks(stream)
+        while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+            yield chunk
+        logger.info(f"Successfully streamed: {filename}")
+    
+    return Response(
+        generate(),
+        mimetype=stream.mime_type,
+        headers={
+            'Content-Disposition': f'attachment; filename={filename}',
+            'Content-Length': str(filesize)
+        }
+    )
+
+@app.route('/api/cache/clear', methods=['POST'])
+async def clear_cache():
+    # File deletion and the locks would otherwise block the event loop
+    cleared = await asyncio.to_thread(clear_caches)
+    logger.info(f"Cleared {cleared} cached downloads")
+    return jsonify({'success': True, 'cleared': cleared})
+
 @app.route('/download/<filename>')
-def serve_file(filename):
+async def serve_file(filename):
     try:
-        return send_file(
+        # Dotfiles such as the cache index are not downloads
+        if filename.startswith('.'):
+            raise FileNotFoundError(filename)
+        
+        accel_prefix = app.config['X_ACCEL_REDIRECT_PREFIX']
+        if accel_prefix:
+            if not (app.config['DOWNLOAD_FOLDER'] / filename).is_file():
+                raise FileNotFoundError(filename)
+            # nginx serves the bytes with sendfile(); we only send headers
+            response = Response('')
+            response.headers['X-Accel-Redirect'] = f"{accel_prefix.rstrip('/')}/{filename}"
+            response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+            return response
+        
+        return await send_file(
             app.config['DOWNLOAD_FOLDER'] / filename,
             as_attachment=True,
-            download_name=filename
+            attachment_filename=filename
         )
     except FileNotFoundError:
         logger.warning(f"File not found: {filename}")
@@ -233,19 +799,19 @@ def serve_file(filename):
         return jsonify({'success': False, 'error': 'An unexpected error occurred'}), 500
 
 @app.errorhandler(413)
-def too_large(e):
+async def too_large(e):
     logger.warning("File upload exceeded size limit")
     return jsonify({'success': False, 'error': 'File too large'}), 413
 
 @app.errorhandler(404)
-def not_found(e):
+async def not_found(e):
     logger.warning(f"404 error: {request.url}")
-    return render_template('error.html', error_message="Page not found"), 404
+    return await render_template('error.html', error_message="Page not found"), 404
 
 @app.errorhandler(500)
-def server_error(e):
+async def server_error(e):
     logger.error(f"500 error: {str(e)}")
-    return render_template('error.html', error_message="Internal server error"), 500
+    return await render_template('error.html', error_message="Internal server error"), 500
 
 if __name__ == '__main__':
     # Added some startup logging